@@ -1,9 +1,9 @@
-from typing import List
-from typing import Union
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 
 from viktor.core import ViktorController
 from viktor.views import PlotlyResult
@@ -15,29 +15,61 @@ from viktor.parametrization import NumberField
 from viktor.parametrization import Parametrization
 from viktor.parametrization import Text
 
-from helper import add_initial_frames
 from helper import add_missing_frames
+from hirschberg_algorithm import State
 from hirschberg_algorithm import run_hirschberg_sinclair_algorithm
 
 
 import json
 from pathlib import Path
 
+# Each animation frame adds to the figure JSON and to the client-side transition cost,
+# so the messages view subsamples its timeline down to at most this many frames.
+MAX_ANIMATION_FRAMES = 200
 
+# Fixed color per state, so every frame uses the same encoding without plotly having to
+# rediscover the categories
+COLOR_MAP = {state.name: color for state, color in zip(State, px.colors.qualitative.Plotly)}
 
-def points_in_circum(n=100) -> List[Union[float, float]]:
+
+
+@lru_cache(maxsize=16)
+def points_in_circum(n=100) -> np.ndarray:
     """Creates points in a circle to visualize the ring network.
 
     Args:
         n (int, optional): The number of points on the circle. Defaults to 100.
 
     Returns:
-        List[Union[float, float]]: A list of x and y coordinates.
+        np.ndarray: An (n + 1, 2) array of x and y coordinates.
     """
-    return [(np.cos(2 * np.pi / n * x), np.sin(2 * np.pi / n * x)) for x in range(0, n + 1)]
+    theta = (2 * np.pi / n) * np.arange(n + 1)
+    return np.column_stack((np.cos(theta), np.sin(theta)))
+
+
+@lru_cache(maxsize=16)
+def _run_algorithm_cached(number_of_nodes: int) -> pd.DataFrame:
+    """Runs the Hirschberg and Sinclair algorithm once per number of nodes."""
+    return run_hirschberg_sinclair_algorithm(number_of_nodes)
+
+
+def run_algorithm(number_of_nodes: int) -> pd.DataFrame:
+    """Runs the Hirschberg and Sinclair algorithm, reusing the result for repeated calls.
 
+    Both views run the same simulation for the same parameters, so caching on the number
+    of nodes avoids spinning up a second name server and network when switching tabs.
+
+    Args:
+        number_of_nodes (int): Number of nodes in the network.
+
+    Returns:
+        pd.DataFrame: The results of the algorithm. A copy is returned, so the cached
+        frame is never mutated by the plotting code.
+    """
+    return _run_algorithm_cached(number_of_nodes).copy()
 
-def get_network_figure(df: pd.DataFrame, mode: str) -> px.scatter:
+
+def get_network_figure(df: pd.DataFrame, mode: str) -> go.Figure:
     """Creates a figure of results of the algorithm.
 
     Args:
@@ -49,19 +81,20 @@ def get_network_figure(df: pd.DataFrame, mode: str) -> px.scatter:
         NotImplementedError: When not implemented mode is called.
 
     Returns:
-        px.scatter: Figure to be used in PlotlyResult
+        go.Figure: Figure to be used in PlotlyResult
     """
     nodes = df["name"].unique()
 
-    # Assign coordinates to the nodes to visualise them
+    # Assign coordinates to the nodes to visualise them. One assign call adds all plot
+    # columns in a single block mutation, with a vectorized map per axis instead of the
+    # per-node boolean masks that scanned the whole frame for every node.
     points = points_in_circum(len(nodes))
-    df["x"] = 0
-    df["y"] = 0
-    for idx, name in enumerate(nodes):
-        df.loc[df["name"] == name, "x"] = points[idx][0]
-        df.loc[df["name"] == name, "y"] = points[idx][1]
+    df = df.assign(
+        x=df["name"].map(dict(zip(nodes, points[:, 0]))),
+        y=df["name"].map(dict(zip(nodes, points[:, 1]))),
+        size=1,  # Dummy value to increase the scatter dots
+    )
     if mode == "rounds":
-        df["size"] = 1  # Dummy value to increase the scatter dots
         fig = px.scatter(
             df,
             x="x",
@@ -75,22 +108,71 @@ def get_network_figure(df: pd.DataFrame, mode: str) -> px.scatter:
         )
     elif mode == "messages":
         df = add_missing_frames(df)
-        df = add_initial_frames(df)
-        df["size"] = 1
-        fig = px.scatter(
-            df,
-            x="x",
-            y="y",
-            animation_frame="clock",
-            color="state",
-            animation_group="name",
-            hover_name="id",
-            size="size",
-            size_max=25,
-            range_x=(-1.1, 1.1),
-            range_y=(-1.1, 1.1),
+
+        # Keep the animation responsive for large rings by sampling the timeline evenly
+        unique_clocks = df["clock"].unique()
+        if len(unique_clocks) > MAX_ANIMATION_FRAMES:
+            keep = np.linspace(0, len(unique_clocks) - 1, MAX_ANIMATION_FRAMES).astype(int)
+            df = df[df["clock"].isin(unique_clocks[keep])]
+
+        # Build the animation with graph_objects directly: one base trace plus a slim
+        # frame per clock tick, instead of letting plotly express split the DataFrame
+        # into a full set of traces for every frame.
+        frames = [
+            go.Frame(
+                name=str(clock),
+                data=[
+                    go.Scatter(
+                        x=group["x"],
+                        y=group["y"],
+                        mode="markers",
+                        hovertext=group["id"].astype(str),
+                        marker={"size": 25, "color": group["state"].map(COLOR_MAP)},
+                    )
+                ],
+                traces=[0],
+            )
+            for clock, group in df.groupby("clock", sort=True)
+        ]
+        base_trace = frames[0].data[0].update(showlegend=False)
+        legend_traces = [
+            go.Scatter(
+                x=[None],
+                y=[None],
+                mode="markers",
+                name=state.name,
+                marker={"size": 10, "color": COLOR_MAP[state.name]},
+            )
+            for state in State
+        ]
+        play_args = {"frame": {"duration": 50, "redraw": False}, "fromcurrent": True, "transition": {"duration": 10}}
+        stop_args = {"frame": {"duration": 0, "redraw": False}, "mode": "immediate"}
+        fig = go.Figure(
+            data=[base_trace] + legend_traces,
+            frames=frames,
+            layout=go.Layout(
+                xaxis={"range": (-1.1, 1.1)},
+                yaxis={"range": (-1.1, 1.1)},
+                transition={"duration": 10},
+                updatemenus=[
+                    {
+                        "type": "buttons",
+                        "buttons": [
+                            {"label": "&#9654;", "method": "animate", "args": [None, play_args]},
+                            {"label": "&#9724;", "method": "animate", "args": [[None], stop_args]},
+                        ],
+                    }
+                ],
+                sliders=[
+                    {
+                        "steps": [
+                            {"label": frame.name, "method": "animate", "args": [[frame.name], stop_args]}
+                            for frame in frames
+                        ]
+                    }
+                ],
+            ),
         )
-        fig.update_layout(transition={"duration": 10})
     else:
         raise NotImplementedError("Currently implemented: messages, rounds.")
 
@@ -116,14 +198,14 @@ class Controller(ViktorController):
     @PlotlyView("Rounds", duration_guess=10)
     def visualize_network(self, params, **kwargs):
         """Run the Hirschberg and Sinclair algorithm and plot the remaining nodes after each round."""
-        df = run_hirschberg_sinclair_algorithm(params.number_of_nodes)
+        df = run_algorithm(params.number_of_nodes)
         fig = get_network_figure(df, "rounds")
         return PlotlyResult(fig.to_json())
 
     @PlotlyView("Messages", duration_guess=10)
     def visualize_messages(self, params, **kwargs):
         """Run the Hirschberg and Sinclair algorithm and plot the states of each node during runtime."""
-        df = run_hirschberg_sinclair_algorithm(params.number_of_nodes)
+        df = run_algorithm(params.number_of_nodes)
         fig = get_network_figure(df, "messages")
         return PlotlyResult(fig.to_json())
     
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 from hirschberg_algorithm import State
@@ -14,13 +15,20 @@ def add_initial_frames(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Results of the algorithm with dummy initial states.
     """
-    columns = df.columns
-    initial_frames = pd.DataFrame(columns=columns)
-    for state in State:
-        data = {"name": -state.value - 1, "id": 0, "round": 0, "clock": 0, "state": state.name, "x": 2, "y": 0}
-        initial_frames = initial_frames.append(data, ignore_index=True)
-    new_df = initial_frames.append(df, ignore_index=True)
-    return new_df
+    number_of_states = len(State)
+    initial_frames = pd.DataFrame(
+        {
+            "name": -np.arange(1, number_of_states + 1),
+            "id": 0,
+            "round": 0,
+            "clock": 0,
+            "state": [state.name for state in State],
+            "x": 2,
+            "y": 0,
+        },
+        columns=df.columns,
+    )
+    return pd.concat([initial_frames, df], ignore_index=True)
 
 
 def add_missing_frames(df: pd.DataFrame) -> pd.DataFrame:
@@ -32,21 +40,24 @@ def add_missing_frames(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Results of the algorithm with all the nodes per timestamp.
     """
-    frames = df["clock"].to_numpy()  # The timeline for the animation
+    clocks = df["clock"].unique()  # The timeline for the animation
     names = df["name"].unique()
 
-    df = df.reset_index(drop=True)
-    initial_states = df.loc[0 : len(names) - 1]
-    new_df = pd.DataFrame(columns=df.columns)
-    for (_, row), frame in zip(df.iterrows(), frames):
-        if frame > 0:
-            initial_states["clock"] = frame
-            initial_states.loc[(df.name == row["name"]), "state"] = row.at["state"]
-            new_df = pd.concat([new_df, initial_states])
-        else:
-            new_df = new_df.append(row, ignore_index=True)
-
-    new_df.sort_values(by=["clock", "name"])
+    # Build the full (clock, name) grid in one shot and forward-fill the state of each
+    # node along its own timeline, instead of concatenating a snapshot per row.
+    grid = pd.MultiIndex.from_product([clocks, names], names=["clock", "name"]).to_frame(index=False)
+    new_df = grid.merge(df, on=["clock", "name"], how="left")
+
+    fill_columns = [column for column in df.columns if column not in ("clock", "name")]
+    new_df = new_df.sort_values(by=["name", "clock"])
+    new_df[fill_columns] = new_df.groupby("name")[fill_columns].ffill()
+
+    # The left merge upcasts the integer columns to float to hold the gaps. Every node
+    # has a clock-0 row, so no NaNs survive the ffill and the cast back is safe.
+    for column in ("id", "round"):
+        new_df[column] = new_df[column].astype(df[column].dtype)
+
+    new_df = new_df.sort_values(by=["clock", "name"])
     new_df = new_df.reset_index(drop=True)
 
     return new_df
@@ -28,6 +28,12 @@ class Process(object):
         """Add a proxy as a neighbour so we can loop self._neighbours to send stuff to our neighbours"""
         self._neighbours.append(proxy)
 
+    @Pyro4.expose
+    @Pyro4.oneway
+    def set_neighbours(self, *proxies: Pyro4.Proxy):
+        """Set all neighbours in a single call, so wiring a topology costs one round-trip per process"""
+        self._neighbours = list(proxies)
+
     @property
     @Pyro4.expose
     def neighbours(self):